@@ -498,5 +498,9 @@ def instantiate_decoder(model_engine, executor_config, spec_decoder,
     else:
         decoder = TorchDecoder(
             max_seq_len=model_engine.max_seq_len,
-            mixed_decoder=pytorch_backend_config.mixed_decoder)
+            mixed_decoder=pytorch_backend_config.mixed_decoder,
+            # Keep in sync with PyExecutor.num_micro_batches: the decoder's
+            # host-buffer ring must cover every in-flight decoder state
+            num_micro_batches=mapping.pp_size +
+            pytorch_backend_config.enable_overlap_scheduler)
     return decoder
@@ -1,9 +1,16 @@
-import itertools
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+import numpy as np
 import torch
 
+try:
+    import triton
+    import triton.language as tl
+    IS_TRITON_AVAILABLE = True
+except ImportError:
+    IS_TRITON_AVAILABLE = False
+
 from tensorrt_llm._utils import torch_dtype_to_binding
 from tensorrt_llm.bindings import (DataType, ModelConfig, WorldConfig,
                                    make_sampling_config)
@@ -19,7 +26,7 @@ from tensorrt_llm.bindings.internal.runtime import (BufferManager, CudaStream,
                                                     SpeculativeDecodingMode)
 from tensorrt_llm.mapping import Mapping
 
-from .llm_request import LlmRequest, LlmRequestState, LogProbs
+from .llm_request import LlmRequest, LlmRequestState, StopWordsAutomaton
 from .scheduler import ScheduledRequests
 
 
@@ -29,8 +36,10 @@ class DecoderState:
 
     logits: torch.Tensor = None
 
-    # Set when decode_async() has evaluated these to avoid computing again in update_requests()
-    log_probs: list[LogProbs] | None = None
+    # Log probs of the sampled tokens, copied to host as one batched D2H
+    # transfer when decode_async() has evaluated them, to avoid computing
+    # again in update_requests()
+    log_probs_host: torch.Tensor | None = None
 
     new_tensors_device: dict[str, torch.Tensor] = None
     new_tensors_host: dict[str, torch.Tensor] = None
@@ -78,6 +87,28 @@ class EarlyStopDecoder(Decoder):
             request.py_result.append_context_logits(logits)
 
 
+def gumbel_argmax_sample(sampling_probs):
+    """Draw one sample per row from the given (possibly unnormalized)
+    probabilities via the Gumbel-max trick.
+
+    argmax(log(p) + gumbel) is an exact sample from the normalized
+    distribution, so this needs neither the renormalization division nor the
+    multi-pass CDF construction of torch.multinomial; zeroed entries are
+    never selected.
+
+    The noise is always drawn and combined in fp32, regardless of the dtype
+    of sampling_probs: a reduced-precision uniform can round to exactly 1.0,
+    turning the gumbel term into +inf and making masked (zero-probability)
+    lanes score log(0) + inf = NaN, i.e. selectable; and bf16 gumbel noise
+    is quantized coarsely enough to visibly distort the distribution.
+    """
+    u = torch.rand(sampling_probs.shape,
+                   dtype=torch.float32,
+                   device=sampling_probs.device).clamp_(min=1e-20)
+    gumbel = -(-u.log()).log()
+    return (sampling_probs.float().log() + gumbel).argmax(dim=-1)
+
+
 def top_k_sampling_batch(logits, top_k=50):
     logits_dim = logits.dim()
     if logits_dim == 1:
@@ -85,61 +116,165 @@ def top_k_sampling_batch(logits, top_k=50):
     # logits should be 2D ：[batch_size, vocab_size]
     batch_size, vocab_size = logits.size()
 
-    raw_probs = torch.softmax(logits, dim=-1)
-
-    # get first top_k logits of each sample and their indices
-    values, indices = torch.topk(logits, top_k, dim=-1)
-    min_values = values[:, -1].unsqueeze(-1).expand(batch_size, vocab_size)
-
-    # set the logits who is less than first top_k logits to -inf
-    logits = torch.where(logits < min_values,
-                         torch.full_like(logits, float('-inf')), logits)
+    # topk order is unchanged in bf16 and softmax is numerically safe after
+    # the max-subtract, so halve the DRAM traffic of the memory-bound
+    # [batch_size, vocab_size] passes; the denominator is accumulated in fp32
+    if logits.dtype == torch.float32:
+        logits = logits.to(torch.bfloat16)
+
+    # softmax once; topk on probs selects the same entries as topk on logits
+    # since softmax is monotone
+    raw_probs = torch.softmax(logits, dim=-1,
+                              dtype=torch.float32).to(logits.dtype)
+
+    # get first top_k probs of each sample and their indices
+    # top_k may be a scalar (shared by all rows) or a [batch_size] tensor
+    # holding a per-row k
+    if isinstance(top_k, torch.Tensor):
+        max_k = int(top_k.max())
+        values, indices = torch.topk(raw_probs, max_k, dim=-1)
+        values = torch.where(
+            torch.arange(max_k, device=logits.device) < top_k.unsqueeze(-1),
+            values, torch.zeros_like(values))
+    else:
+        values, indices = torch.topk(raw_probs, top_k, dim=-1)
 
-    # compute probability distribution
-    probs = torch.softmax(logits, dim=-1)
+    # keep only the top_k probabilities; the probability of the sampled token
+    # is read from raw_probs, so no second softmax is needed
+    sampling_probs = torch.zeros_like(raw_probs).scatter_(-1, indices, values)
 
-    # sample from the distribution and generate result of [batch_size, 1]
-    next_tokens = torch.multinomial(probs, num_samples=1).squeeze(-1)
+    # sample from the distribution and generate result of [batch_size]
+    next_tokens = gumbel_argmax_sample(sampling_probs)
     token_probs = torch.gather(raw_probs, dim=1,
                                index=next_tokens.unsqueeze(1)).squeeze(-1)
-    log_probs = torch.log(token_probs)
+    # keep the reported log prob in fp32
+    log_probs = torch.log(token_probs.float())
     return next_tokens, log_probs
 
 
-def top_p_sampling_batch(logits, top_p=0.9):
+if IS_TRITON_AVAILABLE:
+
+    @triton.jit
+    def top_k_sampling_kernel(logits_ptr, next_tokens_ptr, log_probs_ptr,
+                              row_stride, seed, top_k,
+                              VOCAB_SIZE: tl.constexpr,
+                              BLOCK_SIZE: tl.constexpr):
+        # One program per row: load the logits once, compute the top-k
+        # threshold, softmax statistics and the sampled token in registers so
+        # the [vocab_size] row is only read from DRAM a single time.
+        row = tl.program_id(0)
+        offsets = tl.arange(0, BLOCK_SIZE)
+        mask = offsets < VOCAB_SIZE
+        x = tl.load(logits_ptr + row * row_stride + offsets,
+                    mask=mask,
+                    other=float('-inf')).to(tl.float32)
+
+        # log-softmax statistics over the full vocab for the raw log prob
+        row_max = tl.max(x, 0)
+        log_sum_exp = tl.log(tl.sum(tl.exp(x - row_max), 0))
+
+        # top-k found by peeling the max lane one iteration at a time;
+        # tl.argmax takes the lowest index among equal values, so ties are
+        # broken by index like torch.topk and duplicated logits (common with
+        # upcast fp16/bf16 values) can't let more than k lanes survive
+        work = x
+        for _ in range(top_k):
+            peel = tl.argmax(work, 0)
+            work = tl.where(offsets == peel, float('-inf'), work)
+        kept = mask & (work == float('-inf')) & (x > float('-inf'))
+
+        # Gumbel-max trick: argmax(logits + gumbel) over the kept lanes is an
+        # exact sample from softmax(logits) restricted to the top-k, without a
+        # separate multinomial pass.
+        u = tl.rand(seed, row * BLOCK_SIZE + offsets)
+        gumbel = -tl.log(-tl.log(u + 1e-20) + 1e-20)
+        scores = tl.where(kept, x + gumbel, float('-inf'))
+        next_token = tl.argmax(scores, 0)
+
+        token_logit = tl.sum(tl.where(offsets == next_token, x, 0.0), 0)
+        tl.store(next_tokens_ptr + row, next_token)
+        tl.store(log_probs_ptr + row, token_logit - row_max - log_sum_exp)
+
+
+def top_k_sample_triton(logits, top_k=50):
+    """Fused single-pass equivalent of top_k_sampling_batch for CUDA inputs."""
     logits_dim = logits.dim()
     if logits_dim == 1:
         logits = logits.unsqueeze(0)
     # logits should be 2D ：[batch_size, vocab_size]
     batch_size, vocab_size = logits.size()
 
-    raw_probs = torch.softmax(logits, dim=-1)
-
-    # sort the logits of each sample in descending order
-    sorted_logits, sorted_indices = torch.sort(logits, descending=True, dim=-1)
-
-    # compute  cumulative probability distribution of each sample
-    cumulative_probs = torch.cumsum(torch.softmax(sorted_logits, dim=-1),
-                                    dim=-1)
-
-    # get the location of top_p
-    sorted_indices_to_remove = cumulative_probs > top_p
-    sorted_indices_to_remove[:, 1:] = sorted_indices_to_remove[:, :-1].clone()
-    sorted_indices_to_remove[:, 0] = 0
+    next_tokens = torch.empty(batch_size,
+                              dtype=torch.int64,
+                              device=logits.device)
+    log_probs = torch.empty(batch_size,
+                            dtype=torch.float32,
+                            device=logits.device)
+    seed = int(torch.randint(0, 2**31 - 1, (1, )).item())
+
+    BLOCK_SIZE = triton.next_power_of_2(vocab_size)
+    num_warps = 4 if BLOCK_SIZE < 8192 else (8 if BLOCK_SIZE < 32768 else 16)
+    top_k_sampling_kernel[(batch_size, )](logits,
+                                          next_tokens,
+                                          log_probs,
+                                          logits.stride(0),
+                                          seed,
+                                          top_k,
+                                          VOCAB_SIZE=vocab_size,
+                                          BLOCK_SIZE=BLOCK_SIZE,
+                                          num_warps=num_warps)
+    return next_tokens, log_probs
 
-    # set the logits to -inf whose is outside top_p
-    indices_to_remove = sorted_indices_to_remove.scatter(
-        1, sorted_indices, sorted_indices_to_remove)
-    logits = logits.masked_fill(indices_to_remove, float('-inf'))
 
-    # compute probability distribution
-    probs = torch.softmax(logits, dim=-1)
+def top_p_sampling_batch(logits, top_p=0.9):
+    logits_dim = logits.dim()
+    if logits_dim == 1:
+        logits = logits.unsqueeze(0)
+    # logits should be 2D ：[batch_size, vocab_size]
+    batch_size, vocab_size = logits.size()
 
-    # sample from the distribution and generate result of [batch_size, 1]
-    next_tokens = torch.multinomial(probs, num_samples=1).squeeze(-1)
+    # top_p may be a scalar (shared by all rows) or a [batch_size] tensor
+    # holding a per-row p
+    if isinstance(top_p, torch.Tensor):
+        top_p = top_p.unsqueeze(-1)
+
+    # sort order is unchanged in bf16 and softmax is numerically safe after
+    # the max-subtract, so halve the DRAM traffic of the memory-bound
+    # [batch_size, vocab_size] passes; reductions are accumulated in fp32
+    if logits.dtype == torch.float32:
+        logits = logits.to(torch.bfloat16)
+
+    # softmax once; all masking below happens in probability space
+    raw_probs = torch.softmax(logits, dim=-1,
+                              dtype=torch.float32).to(logits.dtype)
+
+    # sort the probabilities of each sample in descending order
+    sorted_probs, sorted_indices = torch.sort(raw_probs,
+                                              descending=True,
+                                              dim=-1)
+
+    # per-row nucleus cutoff: the number of leading sorted entries whose
+    # cumulative probability stays below top_p, plus one so the entry
+    # crossing the threshold is kept
+    cumulative_probs = torch.cumsum(sorted_probs, dim=-1,
+                                    dtype=torch.float32)
+    cutoff = (cumulative_probs < top_p).sum(-1, keepdim=True) + 1
+
+    # zero the tail directly in sorted order; no shifted mask (with its
+    # clone) and no scatter back to vocab order, since we sample a position
+    # in the sorted space and map it back through sorted_indices. sort gave
+    # us a private copy, so the masking can be done in place
+    keep = torch.arange(vocab_size, device=logits.device) < cutoff
+    sorted_probs.mul_(keep)
+
+    # sample from the distribution and generate result of [batch_size]
+    sampled_pos = gumbel_argmax_sample(sorted_probs)
+    next_tokens = sorted_indices.gather(1,
+                                        sampled_pos.unsqueeze(-1)).squeeze(-1)
     token_probs = torch.gather(raw_probs, dim=1,
                                index=next_tokens.unsqueeze(1)).squeeze(-1)
-    log_probs = torch.log(token_probs)
+    # keep the reported log prob in fp32
+    log_probs = torch.log(token_probs.float())
     return next_tokens, log_probs
 
 
@@ -152,27 +287,86 @@ def greedy_search_sampling_batch(logits):
     return next_tokens, log_probs
 
 
-def decode_single_request(request: LlmRequest, logits):
-    assert logits.dim(
-    ) == 2 and logits.shape[0] == 1, "logits should have shape [1, vocab_size]"
-    if request.sampling_config.top_p is not None and len(
-            request.sampling_config.top_p) > 0:
-        next_tokens, log_probs = top_p_sampling_batch(
-            logits, request.sampling_config.top_p[0])
-    elif request.sampling_config.top_k is not None and len(
-            request.sampling_config.top_k) > 0:
-        next_tokens, log_probs = top_k_sampling_batch(
-            logits, request.sampling_config.top_k[0])
-    else:
-        next_tokens, log_probs = greedy_search_sampling_batch(logits)
-    return next_tokens, log_probs
+def get_sampling_strategy(request: LlmRequest) -> tuple:
+    """Classify the request's sampling mode once and cache it on the request,
+    so the hot loops don't redo the sampling_config attribute lookups and
+    None/len checks on every decoding step.
+
+    Returns one of ('top_p', p), ('top_k', k) or ('greedy', None).
+    """
+    strategy = getattr(request, '_py_sampling_strategy', None)
+    if strategy is None:
+        sampling_config = request.sampling_config
+        if sampling_config.top_p is not None and len(
+                sampling_config.top_p) > 0:
+            strategy = ('top_p', sampling_config.top_p[0])
+        elif sampling_config.top_k is not None and len(
+                sampling_config.top_k) > 0:
+            strategy = ('top_k', sampling_config.top_k[0])
+        else:
+            strategy = ('greedy', None)
+        request._py_sampling_strategy = strategy
+    return strategy
 
 
 class TorchDecoder(Decoder):
 
-    def __init__(self, max_seq_len: int, mixed_decoder: bool = False):
+    def __init__(self,
+                 max_seq_len: int,
+                 mixed_decoder: bool = False,
+                 is_spec_decode: bool = False,
+                 num_micro_batches: int = 1):
         self.max_seq_len = max_seq_len
         self.mixed_decoder = mixed_decoder
+        # Speculative decoding is fixed for the lifetime of the decoder; when
+        # off, update_requests skips the extend/generation partition entirely
+        self.is_spec_decode = is_spec_decode
+        # Persistent sampling buffers for _batch_decode, allocated lazily once
+        # the token count is known and reused across steps, so the hot path
+        # skips allocator calls and the D2H copy targets pinned memory. The
+        # ring must cover every decoder state the executor keeps in flight:
+        # with pipeline parallelism up to num_micro_batches states are alive
+        # before the oldest is read in update_requests, and plain overlap
+        # scheduling needs two sets.
+        self._num_buffer_sets = max(2, num_micro_batches)
+        self._batch_decode_buffers: list[dict[str, torch.Tensor]] | None = None
+        self._batch_decode_buffer_idx = 0
+        # CUDA graphs for the steady-state sampling path, keyed by (bucketed
+        # token count, vocab size, dtype, buffer set); see
+        # _batch_decode_graphed. Power-of-two bucketing keeps the entry count
+        # logarithmic in the batch size; the explicit cap is a backstop.
+        self._graph_cache: dict[tuple, tuple[torch.cuda.CUDAGraph,
+                                             torch.Tensor]] = {}
+        self._max_cached_graphs = 16 * self._num_buffer_sets
+
+    def _get_batch_decode_buffers(self, num_tokens: int,
+                                  logits: torch.Tensor) -> dict[str,
+                                                                torch.Tensor]:
+        buffers = self._batch_decode_buffers
+        if (buffers is None
+                or buffers[0]["max_values"].shape[0] < num_tokens
+                or buffers[0]["max_values"].dtype != logits.dtype):
+            # Captured graphs reference the old buffers; drop them on regrowth
+            self._graph_cache.clear()
+            # Allocate at the next power of two so a fluctuating batch size
+            # regrows the buffers (and re-captures graphs) O(log) times
+            capacity = 1 << (num_tokens - 1).bit_length()
+            self._batch_decode_buffers = buffers = [{
+                "max_values":
+                torch.empty(capacity,
+                            dtype=logits.dtype,
+                            device=logits.device),
+                "new_tokens_device":
+                torch.empty(capacity, dtype=torch.int64,
+                            device=logits.device),
+                "new_tokens_host":
+                torch.empty(capacity, dtype=torch.int64, pin_memory=True),
+            } for _ in range(self._num_buffer_sets)]
+        # Rotate through the ring so every in-flight decoder state keeps its
+        # own host copy until update_requests has read it
+        self._batch_decode_buffer_idx = (self._batch_decode_buffer_idx +
+                                         1) % self._num_buffer_sets
+        return buffers[self._batch_decode_buffer_idx]
 
     def _meet_max_token_stop_criteria(self, request: LlmRequest,
                                       num_tokens: int):
@@ -185,17 +379,19 @@ class TorchDecoder(Decoder):
             assert isinstance(
                 request.py_stop_words_list,
                 list), "request.py_stop_words_list should be a list"
-            stop_words_list, prefix_sum = request.py_stop_words_list
+            automaton = request.py_stop_words_automaton
+            if automaton is None:
+                stop_words_list, prefix_sum = request.py_stop_words_list
+                automaton = StopWordsAutomaton(stop_words_list, prefix_sum)
+                request.py_stop_words_automaton = automaton
             tokens = request.get_tokens(0)
-            offset = 0
-            for i, offset_end in enumerate(prefix_sum):
-                if i > 0:
-                    offset = prefix_sum[i - 1]
-                stop_word = stop_words_list[offset:offset_end]
-                if len(stop_word) > len(tokens):
-                    continue
-                if tokens[-len(stop_word):] == stop_word:
-                    return True
+            # Feed only the tokens appended since the previous check (the full
+            # history on the first call); a stop word has matched when one
+            # ends exactly at the newest token.
+            matched = False
+            for token in tokens[automaton.num_consumed:]:
+                matched = automaton.advance(token)
+            return matched
         return False
 
     def _handle_stop_criteria(self, request: LlmRequest, new_token: int,
@@ -219,13 +415,128 @@ class TorchDecoder(Decoder):
 
         return False
 
+    def _update_requests_fast(self, decoder_state: DecoderState,
+                              new_tokens_arr: np.ndarray) -> None:
+        """Specialized update loop for the common serving case where no
+        request asked for generation logits or log probs: the handle_logits
+        dispatch and its per-request attribute checks are dropped entirely."""
+        scheduled_requests = decoder_state.scheduled_requests
+        token_idx = 0
+        beam_idx = 0
+
+        for request in scheduled_requests.context_requests:
+            if request.get_context_remaining_length() != 0:
+                token_idx += 1
+                continue
+
+            if request.state != LlmRequestState.GENERATION_COMPLETE:
+                new_token = int(new_tokens_arr[token_idx])
+                num_tokens = request.add_new_token(new_token, beam_idx)
+                self._handle_stop_criteria(request, new_token, num_tokens,
+                                           beam_idx)
+                request.py_decoding_iter += 1
+            token_idx += 1
+
+        # Partition whenever any request carries draft tokens (see the same
+        # check in update_requests), not just when spec decode is configured
+        if self.is_spec_decode or any(
+                request.py_draft_tokens is not None
+                for request in scheduled_requests.generation_requests):
+            generation_requests = []
+            for request in scheduled_requests.generation_requests:
+                if request.py_draft_tokens is not None:
+                    if request.state != LlmRequestState.GENERATION_COMPLETE:
+                        new_token = int(new_tokens_arr[token_idx])
+                        num_tokens = request.add_new_token(new_token, beam_idx)
+                        self._handle_stop_criteria(request, new_token,
+                                                   num_tokens, beam_idx)
+
+                        num_accepted = 0
+                        for draft_token in request.py_draft_tokens:
+                            if draft_token != new_token:
+                                break
+                            num_accepted += 1
+                            new_token = int(new_tokens_arr[token_idx +
+                                                           num_accepted])
+                            num_tokens = request.add_new_token(
+                                new_token, beam_idx)
+
+                            if self._handle_stop_criteria(
+                                    request, new_token, num_tokens, beam_idx):
+                                break
+                        request.py_decoding_iter += 1
+                        request.py_num_accepted_draft_tokens = num_accepted
+                        request.py_rewind_len = request.py_draft_pages_allocated - num_accepted
+                    token_idx += len(request.py_draft_tokens) + 1
+                else:
+                    generation_requests.append(request)
+        else:
+            generation_requests = scheduled_requests.generation_requests
+
+        num_generation = len(generation_requests)
+        if num_generation == 0:
+            return
+
+        # Evaluate the end-id and length stop criteria for the whole batch as
+        # two vectorized comparisons instead of O(batch) Python conditionals;
+        # the loop below only branches on the precomputed boolean masks
+        gen_tokens = new_tokens_arr[token_idx:token_idx + num_generation]
+        end_ids = np.fromiter(
+            (-1 if request.py_end_id is None else request.py_end_id
+             for request in generation_requests),
+            dtype=np.int64,
+            count=num_generation)
+        new_num_tokens = np.fromiter(
+            (request.get_num_tokens(beam_idx)
+             for request in generation_requests),
+            dtype=np.int64,
+            count=num_generation) + 1
+        max_new_tokens = np.fromiter(
+            (request.py_max_new_tokens for request in generation_requests),
+            dtype=np.int64,
+            count=num_generation)
+        orig_prompt_lens = np.fromiter(
+            (request.py_orig_prompt_len for request in generation_requests),
+            dtype=np.int64,
+            count=num_generation)
+        end_mask = gen_tokens == end_ids
+        len_mask = ((new_num_tokens - orig_prompt_lens >= max_new_tokens)
+                    | (new_num_tokens >= self.max_seq_len))
+
+        for idx, request in enumerate(generation_requests):
+            if request.state != LlmRequestState.GENERATION_COMPLETE:
+                request.add_new_token(int(gen_tokens[idx]), beam_idx)
+                if end_mask[idx]:
+                    request.state = LlmRequestState.GENERATION_COMPLETE
+                    request.set_finished_reason(FinishReason.END_ID, beam_idx)
+                elif len_mask[idx]:
+                    request.state = LlmRequestState.GENERATION_COMPLETE
+                    request.set_finished_reason(FinishReason.LENGTH, beam_idx)
+                elif request.py_stop_words_list and \
+                        self._meet_stop_token_criteria(request):
+                    request.state = LlmRequestState.GENERATION_COMPLETE
+                    request.set_finished_reason(FinishReason.STOP_WORDS,
+                                                beam_idx)
+                request.py_decoding_iter += 1
+
     def update_requests(self, decoder_state: DecoderState) -> None:
         if decoder_state.decoder_event:
             decoder_state.decoder_event.synchronize()
-        new_tokens_list = decoder_state.new_tensors_host[
-            "new_tokens_host"].tolist()
+        # Zero-copy view on the host tensor; avoids materializing a PyObject
+        # per token the way .tolist() does
+        new_tokens_arr = decoder_state.new_tensors_host[
+            "new_tokens_host"].numpy()
         scheduled_requests = decoder_state.scheduled_requests
 
+        # Pick the update loop once per step: when no logits were kept or no
+        # request wants them, use the specialized loop without handle_logits
+        if decoder_state.logits is None or not any(
+                request.py_return_generation_logits
+                or request.py_return_log_probs
+                for request in scheduled_requests.all_requests):
+            self._update_requests_fast(decoder_state, new_tokens_arr)
+            return
+
         request_idx = 0
         token_idx = 0
         beam_idx = 0
@@ -249,9 +560,12 @@ class TorchDecoder(Decoder):
             if not request.py_return_log_probs:
                 return
 
-            if decoder_state.log_probs:
-                log_probs = decoder_state.log_probs[request_idx]
+            if decoder_state.log_probs_host is not None:
+                log_probs = decoder_state.log_probs_host[current_slice]
             else:
+                # Decoders that don't precompute log probs in decode_async
+                # (e.g. Eagle3Decoder's _batch_decode) fall back to deriving
+                # them from the kept logits
                 _, log_probs = greedy_search_sampling_batch(current_logits)
             request.py_result.append_log_probs([log_probs.tolist()])
 
@@ -261,7 +575,7 @@ class TorchDecoder(Decoder):
                 continue
 
             if request.state != LlmRequestState.GENERATION_COMPLETE:
-                new_token = new_tokens_list[token_idx]
+                new_token = int(new_tokens_arr[token_idx])
                 num_tokens = request.add_new_token(new_token, beam_idx)
                 self._handle_stop_criteria(request, new_token, num_tokens,
                                            beam_idx)
@@ -272,17 +586,28 @@ class TorchDecoder(Decoder):
         if hasattr(scheduled_requests, 'chunked_requests'):
             request_idx += len(scheduled_requests.chunked_requests)
 
-        extend_requests = []
-        generation_requests = []
-        for request in scheduled_requests.generation_requests:
-            if request.py_draft_tokens is not None:
-                extend_requests.append(request)
-            else:
-                generation_requests.append(request)
+        # Draft tokens usually come from a spec-decode decoder, but a draft-
+        # token resource manager can attach them to requests under a plain
+        # TorchDecoder too, so partition whenever any request carries them
+        if self.is_spec_decode or any(
+                request.py_draft_tokens is not None
+                for request in scheduled_requests.generation_requests):
+            extend_requests = []
+            generation_requests = []
+            for request in scheduled_requests.generation_requests:
+                if request.py_draft_tokens is not None:
+                    extend_requests.append(request)
+                else:
+                    generation_requests.append(request)
+        else:
+            # No request carries draft tokens, so skip building the two
+            # partition lists every step
+            extend_requests = ()
+            generation_requests = scheduled_requests.generation_requests
 
         for request in extend_requests:
             if request.state != LlmRequestState.GENERATION_COMPLETE:
-                new_token = new_tokens_list[token_idx]
+                new_token = int(new_tokens_arr[token_idx])
                 num_tokens = request.add_new_token(new_token, beam_idx)
                 self._handle_stop_criteria(request, new_token, num_tokens,
                                            beam_idx)
@@ -295,7 +620,7 @@ class TorchDecoder(Decoder):
                         # Reject.
                         break
                     num_accepted += 1
-                    new_token = new_tokens_list[token_idx + num_accepted]
+                    new_token = int(new_tokens_arr[token_idx + num_accepted])
                     num_tokens = request.add_new_token(new_token, beam_idx)
 
                     if self._handle_stop_criteria(request, new_token,
@@ -309,7 +634,7 @@ class TorchDecoder(Decoder):
 
         for request in generation_requests:
             if request.state != LlmRequestState.GENERATION_COMPLETE:
-                new_token = new_tokens_list[token_idx]
+                new_token = int(new_tokens_arr[token_idx])
                 num_tokens = request.add_new_token(new_token, beam_idx)
                 self._handle_stop_criteria(request, new_token, num_tokens,
                                            beam_idx)
@@ -324,36 +649,75 @@ class TorchDecoder(Decoder):
         state = DecoderState(
             scheduled_requests=scheduled_requests,
             logits=logits,
-            log_probs=[],
         )
 
-        new_tokens_device_array = []
-
-        idx = 0
-
+        # Collect the requests that consume a logits row, in row order
+        requests = []
         for request in scheduled_requests.context_requests:
             assert not request.py_return_context_logits, "Return context logits not supported"
-            token_logits = logits[idx:idx + 1, :]
-            new_token, log_probs = decode_single_request(request, token_logits)
-            new_tokens_device_array.append(new_token)
-            log_probs = [log_probs.tolist()
-                         ] if request.py_return_log_probs else None
-            state.log_probs.append(log_probs)  # Currently always beam_width=1
-            idx += 1
-
+            requests.append(request)
         for request in scheduled_requests.generation_requests:
             if request.state == LlmRequestState.GENERATION_COMPLETE:
                 continue
             assert request.py_draft_tokens is None, "Speculative decoding not supported in SeparateDecoder."
-            token_logits = logits[idx:idx + 1, :]
-            new_token, log_probs = decode_single_request(request, token_logits)
-            new_tokens_device_array.append(new_token)
-            log_probs = [log_probs.tolist()
-                         ] if request.py_return_log_probs else None
-            state.log_probs.append(log_probs)  # Currently always beam_width=1
-            idx += 1
-
-        new_tokens_device = torch.cat(new_tokens_device_array)
+            requests.append(request)
+
+        # Group rows by sampling mode so each mode runs as one batched kernel
+        # call instead of one launch sequence per request
+        greedy_rows = []
+        top_k_rows, top_k_values = [], []
+        top_p_rows, top_p_values = [], []
+        for row, request in enumerate(requests):
+            mode, value = get_sampling_strategy(request)
+            if mode == 'top_p':
+                top_p_rows.append(row)
+                top_p_values.append(value)
+            elif mode == 'top_k':
+                top_k_rows.append(row)
+                top_k_values.append(value)
+            else:
+                greedy_rows.append(row)
+
+        batch_size = len(requests)
+        new_tokens_device = torch.empty(batch_size,
+                                        dtype=torch.int64,
+                                        device=logits.device)
+        batch_log_probs = torch.empty(batch_size,
+                                      dtype=torch.float32,
+                                      device=logits.device)
+
+        def sample_bucket(rows, sampler, *args):
+            row_tensor = torch.tensor(rows,
+                                      dtype=torch.int64,
+                                      device=logits.device)
+            bucket_logits = torch.index_select(logits, 0, row_tensor)
+            tokens, log_probs = sampler(bucket_logits, *args)
+            new_tokens_device.index_copy_(0, row_tensor, tokens)
+            batch_log_probs.index_copy_(0, row_tensor, log_probs.float())
+
+        if greedy_rows:
+            sample_bucket(greedy_rows, greedy_search_sampling_batch)
+        if top_k_rows:
+            if IS_TRITON_AVAILABLE and logits.is_cuda and len(
+                    set(top_k_values)) == 1:
+                sample_bucket(top_k_rows, top_k_sample_triton, top_k_values[0])
+            else:
+                sample_bucket(
+                    top_k_rows, top_k_sampling_batch,
+                    torch.tensor(top_k_values,
+                                 dtype=torch.int64,
+                                 device=logits.device))
+        if top_p_rows:
+            sample_bucket(
+                top_p_rows, top_p_sampling_batch,
+                torch.tensor(top_p_values,
+                             dtype=torch.float32,
+                             device=logits.device))
+
+        if any(request.py_return_log_probs for request in requests):
+            # One batched D2H copy; update_requests() indexes into it after
+            # waiting on the decoder event
+            state.log_probs_host = batch_log_probs.to('cpu', non_blocking=True)
         new_tokens_host = new_tokens_device.to('cpu', non_blocking=True)
         state.new_tensors_device = {"new_tokens_device": new_tokens_device}
         state.new_tensors_host = {"new_tokens_host": new_tokens_host}
@@ -362,16 +726,96 @@ class TorchDecoder(Decoder):
 
         return state
 
+    def _batch_decode_graphed(
+            self, logits: torch.Tensor,
+            buffers: dict[str, torch.Tensor]) -> tuple[torch.Tensor,
+                                                       torch.Tensor]:
+        """Run the argmax + host copy through a CUDA graph.
+
+        Token counts are rounded up to the next power of two, so under
+        continuous batching a handful of graphs gets replayed instead of a
+        capture (a multi-ms stream-sync stall) happening for every batch size
+        seen; the padded rows compute results that are simply never read.
+        Graphs are captured against a static logits buffer and one of the two
+        rotating output buffer sets, are dropped whenever the buffers are
+        reallocated, and the cache is cleared should it ever exceed
+        _max_cached_graphs (e.g. after a dtype change).
+        """
+        num_tokens, vocab_size = logits.shape
+        capacity = buffers["max_values"].shape[0]
+        bucket = min(capacity, 1 << (num_tokens - 1).bit_length())
+        max_values = buffers["max_values"][:bucket]
+        new_tokens_device = buffers["new_tokens_device"][:bucket]
+        new_tokens_host = buffers["new_tokens_host"][:bucket]
+
+        key = (bucket, vocab_size, logits.dtype,
+               self._batch_decode_buffer_idx)
+        entry = self._graph_cache.get(key)
+        if entry is None:
+            if len(self._graph_cache) >= self._max_cached_graphs:
+                self._graph_cache.clear()
+            static_logits = torch.empty((bucket, vocab_size),
+                                        dtype=logits.dtype,
+                                        device=logits.device)
+            static_logits[:num_tokens].copy_(logits, non_blocking=True)
+
+            # Warm up on a side stream before capturing, as required by CUDA
+            # graph semantics (same idiom as DecodingCUDAGraphRunner)
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(2):
+                    torch.max(static_logits,
+                              dim=-1,
+                              out=(max_values, new_tokens_device))
+                    new_tokens_host.copy_(new_tokens_device, non_blocking=True)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                torch.max(static_logits,
+                          dim=-1,
+                          out=(max_values, new_tokens_device))
+                new_tokens_host.copy_(new_tokens_device, non_blocking=True)
+            self._graph_cache[key] = (graph, static_logits)
+        else:
+            graph, static_logits = entry
+            static_logits[:num_tokens].copy_(logits, non_blocking=True)
+        graph.replay()
+        return new_tokens_device[:num_tokens], new_tokens_host[:num_tokens]
+
     def _batch_decode(self, scheduled_requests: ScheduledRequests,
                       model_outputs) -> DecoderState:
         logits = model_outputs["logits"]
-        new_tokens_device = torch.argmax(logits, dim=-1)
-        new_tokens_host = new_tokens_device.to('cpu', non_blocking=True)
+        num_tokens = logits.shape[0]
+        buffers = self._get_batch_decode_buffers(num_tokens, logits)
+        need_log_probs = any(request.py_return_log_probs
+                             for request in scheduled_requests.all_requests)
+        log_probs_host = None
+        if logits.is_cuda and not need_log_probs:
+            # Steady-state fixed-shape case: replay the whole argmax + D2H
+            # sequence as a single CUDA graph launch
+            new_tokens_device, new_tokens_host = self._batch_decode_graphed(
+                logits, buffers)
+        else:
+            max_values = buffers["max_values"][:num_tokens]
+            new_tokens_device = buffers["new_tokens_device"][:num_tokens]
+            torch.max(logits, dim=-1, out=(max_values, new_tokens_device))
+            new_tokens_host = buffers["new_tokens_host"][:num_tokens]
+            new_tokens_host.copy_(new_tokens_device, non_blocking=True)
+            if need_log_probs:
+                # Compute the sampled tokens' log probs for the whole batch at
+                # once instead of one tiny softmax per request in
+                # update_requests
+                log_probs = torch.log_softmax(logits, dim=-1).gather(
+                    -1, new_tokens_device.unsqueeze(-1)).squeeze(-1)
+                log_probs_host = log_probs.to('cpu', non_blocking=True)
         decoder_event = torch.cuda.Event()
         decoder_event.record()
         return DecoderState(
             scheduled_requests=scheduled_requests,
             logits=logits,
+            log_probs_host=log_probs_host,
             new_tensors_device={"new_tokens_device": new_tokens_device},
             new_tensors_host={"new_tokens_host": new_tokens_host},
             decoder_event=decoder_event)
@@ -387,18 +831,20 @@ class TorchDecoder(Decoder):
 class TorchStarAttentionDecoder(TorchDecoder):
 
     def update_one_request(self, request: LlmRequest,
-                           new_tokens_list: list[int], logits: torch.Tensor):
+                           new_tokens_arr: np.ndarray,
+                           log_probs_host: torch.Tensor | None,
+                           logits: torch.Tensor):
         beam_idx = 0
 
         output_token_idx = request.output_token_idx
-        new_token = new_tokens_list[output_token_idx]
+        new_token = int(new_tokens_arr[output_token_idx])
         num_tokens = request.add_new_token(new_token, beam_idx)
 
         current_logits = logits[output_token_idx].unsqueeze(0)
         request.py_result.append_generation_logits(current_logits)
         if request.py_return_log_probs:
-            _, log_probs = greedy_search_sampling_batch(current_logits)
-            request.py_result.append_log_probs([log_probs.tolist()])
+            request.py_result.append_log_probs(
+                [[log_probs_host[output_token_idx].item()]])
 
         self._handle_stop_criteria(request, new_token, num_tokens, beam_idx)
         if request.state != LlmRequestState.GENERATION_COMPLETE:
@@ -407,16 +853,19 @@ class TorchStarAttentionDecoder(TorchDecoder):
     def update_requests(self, decoder_state: DecoderState):
         if decoder_state.decoder_event:
             decoder_state.decoder_event.synchronize()
-        new_tokens_list = decoder_state.new_tensors_host[
-            "new_tokens_host"].tolist()
+        new_tokens_arr = decoder_state.new_tensors_host[
+            "new_tokens_host"].numpy()
+        log_probs_host = decoder_state.log_probs_host
         logits = decoder_state.logits
 
         for request in decoder_state.scheduled_requests.context_requests:
             if request.state == LlmRequestState.GENERATION_IN_PROGRESS:
-                self.update_one_request(request, new_tokens_list, logits)
+                self.update_one_request(request, new_tokens_arr, log_probs_host,
+                                        logits)
 
         for request in decoder_state.scheduled_requests.generation_requests:
-            self.update_one_request(request, new_tokens_list, logits)
+            self.update_one_request(request, new_tokens_arr, log_probs_host,
+                                    logits)
 
 
 class Algorithms:
@@ -463,9 +912,24 @@ class TRTLLMDecoder(Decoder):
                                         num_hidden_layers, 0, num_heads,
                                         hidden_size, self.model_datatype)
 
+        # Every staging buffer ring must cover every decoder state the
+        # executor keeps in flight: the pipeline-parallel loop holds up to
+        # pp_size + 1 (with overlap scheduling) microbatches before the
+        # oldest is read.
+        self._num_buffer_sets = max(2, mapping.pp_size + 1)
+
         self._initialize_store()
         self._instantiate_algorithms()
 
+        # Ring of pinned host buffer sets for the per-step D2H copies,
+        # allocated lazily once the decoder-state shapes are known and rotated
+        # across iterations (see decode_async). On the last PP rank these
+        # buffers also back an isend whose handle is only waited on
+        # num_micro_batches iterations later.
+        self._host_buffers: list[dict[str, torch.Tensor]] | None = None
+        self._host_buffer_idx = 0
+        self._seq_slots_idx = 0
+
     def _initialize_store(self):
         torch_stream = torch.cuda.current_stream()
         cuda_stream = CudaStream(torch_stream.cuda_stream)
@@ -494,12 +958,28 @@ class TRTLLMDecoder(Decoder):
             ),
                         dtype=torch.int,
                         device='cuda'),
+            # A ring of staging pairs, rotated across iterations: the CPU
+            # fills a later step's slot ids before this step's H2D copy is
+            # guaranteed to have run (see decode_async)
+            "seq_slots_host": [
+                torch.empty((self.max_num_sequences, ),
+                            dtype=torch.long,
+                            pin_memory=True)
+                for _ in range(self._num_buffer_sets)
+            ],
+            "seq_slots_device": [
+                torch.empty((self.max_num_sequences, ),
+                            dtype=torch.long,
+                            device='cuda')
+                for _ in range(self._num_buffer_sets)
+            ],
             "sequence_lengths_host":
             torch.empty((
                 self.executor_config.max_batch_size,
                 self.executor_config.max_beam_width,
             ),
-                        dtype=torch.int)
+                        dtype=torch.int,
+                        pin_memory=True)
         }
 
     def _instantiate_algorithms(self):
@@ -550,30 +1030,36 @@ class TRTLLMDecoder(Decoder):
 
     def decode_async(self, scheduled_requests: ScheduledRequests,
                      model_outputs):
-        self.batch_size = scheduled_requests.batch_size
-        for req in itertools.chain(scheduled_requests.context_requests,
-                                   scheduled_requests.generation_requests):
-            self.beam_width = req.sampling_config.beam_width
-            break
+        all_requests = scheduled_requests.all_requests
+        self.batch_size = len(all_requests)
+        # All requests in a batch share the beam width on this path
+        self.beam_width = all_requests[0].sampling_config.beam_width
 
         logits = model_outputs["logits"].reshape(
             (self.batch_size, self.beam_width, -1))
 
         self.setup_decoder_step(scheduled_requests.context_requests)
 
-        # Note: In runtimeBuffers.cpp, num_context_logits is set to:
-        #       numContextLogits.at(batchIdx) = modelConfig.computeContextLogits() ? contextChunkSize : 1;
-        # Revisit this when we support chunked context.
-        num_context_logits = [1] * self.batch_size
-        logits_index = self.algs.handle_context_logits(
-            scheduled_requests.context_requests, num_context_logits, logits,
-            self.store["decoder_buffers"], self.model_config,
-            self.store["buffer_manager"], self.store["cuda_stream"])
+        # Only dispatch the logits-handling algorithms for non-empty request
+        # lists; in steady-state generation-only (or context-only) steps this
+        # saves a full pass of small copies through the decoder buffers.
+        if scheduled_requests.context_requests:
+            # Note: In runtimeBuffers.cpp, num_context_logits is set to:
+            #       numContextLogits.at(batchIdx) = modelConfig.computeContextLogits() ? contextChunkSize : 1;
+            # Revisit this when we support chunked context.
+            num_context_logits = [1] * self.batch_size
+            logits_index = self.algs.handle_context_logits(
+                scheduled_requests.context_requests, num_context_logits, logits,
+                self.store["decoder_buffers"], self.model_config,
+                self.store["buffer_manager"], self.store["cuda_stream"])
+        else:
+            logits_index = 0
 
-        self.algs.handle_generation_logits(
-            logits_index, scheduled_requests.generation_requests,
-            self.store["decoder_buffers"], self.model_config,
-            self.store["buffer_manager"], logits)
+        if scheduled_requests.generation_requests:
+            self.algs.handle_generation_logits(
+                logits_index, scheduled_requests.generation_requests,
+                self.store["decoder_buffers"], self.model_config,
+                self.store["buffer_manager"], logits)
 
         decoding_input, self.decoding_output = self.algs.make_decoding_batch_input_output(
             scheduled_requests.context_requests,
@@ -591,40 +1077,71 @@ class TRTLLMDecoder(Decoder):
         # new_tokens_device_tensor should be, for speculative decoding cases: [batch, 1 + draft_len], others: [batch]
         new_tokens_device_tensor = self.store[
             "new_tokens_device_tensor"][:self.batch_size, :self.beam_width]
-        seq_slots = [
-            request.seq_slot for request in itertools.chain(
-                scheduled_requests.context_requests,
-                scheduled_requests.generation_requests)
-        ]
-        new_tokens_device_tensor.copy_(
-            self.algs.decoder.decoder_state.all_new_tokens[0][seq_slots],
-            non_blocking=True)
+        # Stage the slot ids in a preallocated pinned tensor and gather with
+        # index_select; fancy-indexing with a Python list would allocate and
+        # synchronously upload a fresh index tensor every step. Rotate the
+        # staging ring: this fill can happen before earlier steps' H2D copies
+        # are guaranteed to have executed, and by the time a pair is reused
+        # update_requests has synchronized the event recorded after its copy.
+        self._seq_slots_idx = (self._seq_slots_idx + 1) % self._num_buffer_sets
+        seq_slots_host = self.store["seq_slots_host"][self._seq_slots_idx]
+        seq_slots_host.numpy()[:self.batch_size] = scheduled_requests.seq_slots_np
+        seq_slots_device = self.store["seq_slots_device"][
+            self._seq_slots_idx][:self.batch_size]
+        seq_slots_device.copy_(seq_slots_host[:self.batch_size],
+                               non_blocking=True)
+        new_tokens_device_tensor.copy_(torch.index_select(
+            self.algs.decoder.decoder_state.all_new_tokens[0], 0,
+            seq_slots_device),
+                                       non_blocking=True)
         new_tokens_device_tensor = new_tokens_device_tensor.view(-1)
 
+        gpt_decoder_state = self.algs.decoder.decoder_state
+        if self._host_buffers is None:
+
+            def pinned_like(tensor):
+                return torch.empty(tuple(tensor.shape),
+                                   dtype=tensor.dtype,
+                                   pin_memory=True)
+
+            self._host_buffers = [{
+                "new_tokens_host":
+                pinned_like(gpt_decoder_state.all_new_tokens),
+                "finished_sum_host":
+                pinned_like(gpt_decoder_state.finished_sum),
+                "finish_reasons_host":
+                pinned_like(gpt_decoder_state.finish_reasons),
+            } for _ in range(self._num_buffer_sets)]
+
+        # Rotate through the pinned ring: the CPU (and, on the last PP rank,
+        # MPI) may still be reading an older iteration's outputs while the GPU
+        # writes the current one into another set, so the D2H copies hide
+        # behind later decode steps instead of forcing fresh pageable
+        # allocations every iteration.
+        self._host_buffer_idx = (self._host_buffer_idx +
+                                 1) % self._num_buffer_sets
+        host_buffers = self._host_buffers[self._host_buffer_idx]
+        host_buffers["new_tokens_host"].copy_(gpt_decoder_state.all_new_tokens,
+                                              non_blocking=True)
+        host_buffers["finished_sum_host"].copy_(gpt_decoder_state.finished_sum,
+                                                non_blocking=True)
+        host_buffers["finish_reasons_host"].copy_(
+            gpt_decoder_state.finish_reasons, non_blocking=True)
+
         # NOTE: If we overwrite seq lens on every iteration then overlap scheduling seemingly works.
         #       This could be a race condition.
+        # TODO: We should instead copy into per-iteration destination buffers
+        #       (like the three tensors above), however this doesn't work for
+        #       overlap scheduling atm. It's still not understood why, so the
+        #       seq lens deliberately stay on this single overwritten buffer.
         self.store["sequence_lengths_host"].copy_(
-            self.algs.decoder.decoder_state.sequence_lengths, non_blocking=True)
-
-        # TODO: We should instead copy on every iteration, however this doesn't work for overlap scheduling atm.
-        #       It's still not understood why.
-        # sequence_lengths = self.store["decoder_buffers"].sequence_lengths.to('cpu', non_blocking=True)
-
-        new_output_tokens = self.algs.decoder.decoder_state.all_new_tokens.to(
-            'cpu', non_blocking=True)
-        finished_sum = self.algs.decoder.decoder_state.finished_sum.to(
-            'cpu', non_blocking=True)
-        finish_reasons = self.algs.decoder.decoder_state.finish_reasons.to(
-            'cpu', non_blocking=True)
+            gpt_decoder_state.sequence_lengths, non_blocking=True)
 
         new_tensors_device = {"new_tokens_device": new_tokens_device_tensor}
 
-        new_tensors_host = {
-            "new_tokens_host": new_output_tokens,
-            "finished_sum_host": finished_sum,
-            "finish_reasons_host": finish_reasons,
-            "sequence_lengths_host": self.store["sequence_lengths_host"]
-        }
+        new_tensors_host = dict(host_buffers)
+        new_tensors_host["sequence_lengths_host"] = self.store[
+            "sequence_lengths_host"]
 
         decoder_event = torch.cuda.Event()
         decoder_event.record()
@@ -643,13 +1160,57 @@ class TRTLLMDecoder(Decoder):
         if decoder_event:
             decoder_event.synchronize()
 
-        new_tokens_host = new_tensors_host["new_tokens_host"]
-        finished_sum_host = new_tensors_host["finished_sum_host"]
-        finish_reasons_host = new_tensors_host["finish_reasons_host"]
-        sequence_lengths_host_data = new_tensors_host["sequence_lengths_host"]
+        # Zero-copy numpy views so the per-request loop below reads plain
+        # scalars instead of calling .item() on tensor elements
+        new_tokens_arr = new_tensors_host["new_tokens_host"].numpy()
+        finished_sum_host = new_tensors_host["finished_sum_host"].numpy()
+        finish_reasons_host = new_tensors_host["finish_reasons_host"].numpy(
+        ).reshape(-1)
+        sequence_lengths_host_data = new_tensors_host[
+            "sequence_lengths_host"].numpy().reshape(-1)
+
+        if self.beam_width == 1:
+            # Fast path for the common single-beam case: no per-beam loop,
+            # direct seq_slot indexing and a bulk read of the new tokens
+            beam = 0
+            for request in scheduled_requests.all_requests:
+                if request.is_context_init_state:
+                    continue
+
+                seq_slot = request.seq_slot
+                num_generated_tokens = request.num_draft_tokens + 1
+                current_num_of_tokens = request.max_beam_num_tokens
+
+                seq_len = int(sequence_lengths_host_data[seq_slot])
+                # Clamp at zero: a stale seq len (see the NOTE on the seq-lens
+                # buffer in decode_async) can make the difference negative,
+                # and a negative slice bound would wrap around and append
+                # nearly the whole step dimension
+                num_new_tokens = max(
+                    0,
+                    min(num_generated_tokens,
+                        seq_len - request.get_num_tokens(beam)))
+                for new_token in new_tokens_arr[:num_new_tokens, seq_slot,
+                                                beam].tolist():
+                    request.add_new_token(new_token, beam)
+
+                request.set_finished_reason(
+                    FinishReason(int(finish_reasons_host[seq_slot])), beam)
+
+                # Set number of tokens predicted per runtime iteration. Will be > 1 for speculative decoding.
+                request.update_num_tokens_per_iteration(
+                    request.max_beam_num_tokens - current_num_of_tokens,
+                    self.model_config)
+
+                # Increment the decoding iteration counter
+                if request.state != LlmRequestState.GENERATION_COMPLETE:
+                    request.py_decoding_iter += 1
+
+                if finished_sum_host[seq_slot] == 1:
+                    request.state = LlmRequestState.GENERATION_COMPLETE
+            return
 
-        for request in itertools.chain(scheduled_requests.context_requests,
-                                       scheduled_requests.generation_requests):
+        for request in scheduled_requests.all_requests:
             if request.is_context_init_state:
                 continue
 
@@ -661,8 +1222,9 @@ class TRTLLMDecoder(Decoder):
             num_dropped_tokens = [0] * self.beam_width
 
             for beam in range(self.beam_width):
-                seq_len = sequence_lengths_host_data[seq_slot * self.beam_width
-                                                     + beam].item()
+                seq_len = int(
+                    sequence_lengths_host_data[seq_slot * self.beam_width +
+                                               beam])
                 num_new_tokens[beam] = min(
                     num_generated_tokens,
                     seq_len - request.get_num_tokens(beam))
@@ -670,11 +1232,11 @@ class TRTLLMDecoder(Decoder):
                     beam] = num_generated_tokens - num_new_tokens[beam]
 
                 for step in range(num_new_tokens[beam]):
-                    new_token = new_tokens_host[step][seq_slot][beam]
+                    new_token = int(new_tokens_arr[step, seq_slot, beam])
                     request.add_new_token(new_token, beam)
 
-                finish_reason = finish_reasons_host[seq_slot * self.beam_width +
-                                                    beam].item()
+                finish_reason = int(
+                    finish_reasons_host[seq_slot * self.beam_width + beam])
                 request.set_finished_reason(FinishReason(finish_reason), beam)
 
             # Set number of tokens predicted per runtime iteration. Will be > 1 for speculative decoding.
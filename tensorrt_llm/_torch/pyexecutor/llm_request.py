@@ -1,5 +1,7 @@
+from collections import deque
 from typing import List, Optional
 
+import numpy as np
 import torch
 
 import tensorrt_llm.bindings
@@ -206,6 +208,78 @@ class LlmResponse:
         return getattr(self._response, item)
 
 
+class StopWordsAutomaton:
+    """Aho-Corasick automaton over token ids for incremental stop-word matching.
+
+    Built once per request from the (tokens, prefix_sum) pair produced by
+    convert_wordlist(). advance() consumes one token and returns whether any
+    stop word ends at that token, so the per-step cost is O(1) amortized
+    instead of re-comparing every stop word against the sequence tail.
+    """
+
+    def __init__(self, stop_words_list: list[int], prefix_sum: list[int]):
+        self._goto: list[dict[int, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._terminal: list[bool] = [False]
+        # Convert to numpy once so the per-word segmentation below works on
+        # array views instead of repeated Python list slicing
+        tokens_arr = np.asarray(stop_words_list, dtype=np.int32)
+        prefix_arr = np.asarray(prefix_sum, dtype=np.int64)
+        # prefix_sum is padded with -1 entries, see convert_wordlist()
+        padding = np.nonzero(prefix_arr < 0)[0]
+        if padding.size:
+            prefix_arr = prefix_arr[:padding[0]]
+        offset = 0
+        for offset_end in prefix_arr:
+            self._add_word(tokens_arr[offset:offset_end].tolist())
+            offset = offset_end
+        self._build_failure_links()
+        self.state = 0
+        # Number of sequence tokens consumed so far; lets the caller feed only
+        # the newly appended tokens on each check.
+        self.num_consumed = 0
+
+    def _add_word(self, word: list[int]):
+        if not word:
+            return
+        state = 0
+        for token in word:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(False)
+            state = next_state
+        self._terminal[state] = True
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(token, 0)
+                if fail == next_state:
+                    fail = 0
+                self._fail[next_state] = fail
+                self._terminal[next_state] |= self._terminal[fail]
+                queue.append(next_state)
+
+    def advance(self, token: int) -> bool:
+        """Consume one token and return True if a stop word ends at it."""
+        state = self.state
+        while state and token not in self._goto[state]:
+            state = self._fail[state]
+        state = self._goto[state].get(token, 0)
+        self.state = state
+        self.num_consumed += 1
+        return self._terminal[state]
+
+
 class LlmRequest(tensorrt_llm.bindings.internal.batch_manager.LlmRequest):
     """LlmRequest wraps `bindings.internal.batch_manager.LlmRequest`
     but detour some features to Python implementation"""
@@ -251,6 +325,8 @@ class LlmRequest(tensorrt_llm.bindings.internal.batch_manager.LlmRequest):
         # TODO: remove this when use DynamicDecodeOp in pytorch flow.
         # currently, keep py_stop_words_list as python list, rather than tensor.
         self.py_stop_words_list = stop_words_list
+        # Built lazily by the decoder on the first stop-word check
+        self.py_stop_words_automaton: StopWordsAutomaton | None = None
 
         self.py_result = PyResult(self.py_prompt_len, self.py_max_new_tokens,
                                   return_logits_device_memory, self.streaming,
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from collections import namedtuple
 from typing import Optional
 
+import numpy as np
+
 from tensorrt_llm.bindings import executor as tb_executor
 from tensorrt_llm.bindings import internal as tb_internal
 
@@ -21,6 +23,46 @@ class ScheduledRequests:
         self.context_requests: RequestList = []
         self.generation_requests: RequestList = []
         self.paused_requests: RequestList = []
+        # Caches for the per-step decoder hot paths. The executor rewrites
+        # the request lists in place or wholesale (e.g. stripping chunked
+        # context requests between decode_async and update_requests), so the
+        # caches remember which list objects and lengths they were built from
+        # and are rebuilt whenever either changed.
+        self._all_requests: RequestList | None = None
+        self._all_requests_src: Optional[tuple] = None
+        self._seq_slots_np: Optional[np.ndarray] = None
+
+    @property
+    def all_requests(self) -> RequestList:
+        """Cached concatenation of context and generation requests.
+
+        Rebuilt (together with seq_slots_np) whenever either source list has
+        been reassigned or changed length since the cache was populated.
+        """
+        src = self._all_requests_src
+        if (src is None or src[0] is not self.context_requests
+                or src[1] is not self.generation_requests
+                or len(src[0]) != src[2] or len(src[1]) != src[3]):
+            self._all_requests = self.context_requests + self.generation_requests
+            # Keep references to the source lists so identity checks stay
+            # reliable (a freed list's id could be reused)
+            self._all_requests_src = (self.context_requests,
+                                      self.generation_requests,
+                                      len(self.context_requests),
+                                      len(self.generation_requests))
+            self._seq_slots_np = None
+        return self._all_requests
+
+    @property
+    def seq_slots_np(self) -> np.ndarray:
+        """Cached seq slots of all_requests; valid once slots are assigned."""
+        all_requests = self.all_requests  # may invalidate _seq_slots_np
+        if self._seq_slots_np is None:
+            self._seq_slots_np = np.fromiter(
+                (request.seq_slot for request in all_requests),
+                dtype=np.int64,
+                count=len(all_requests))
+        return self._seq_slots_np
 
     @property
     def is_generation_only(self) -> bool:
@@ -116,6 +116,9 @@ class Eagle3SpecMetadata(SpecMetadata):
 
 class Eagle3Decoder(TorchDecoder):
 
+    def __init__(self, max_seq_len: int):
+        super().__init__(max_seq_len=max_seq_len, is_spec_decode=True)
+
     def _batch_decode(self, scheduled_requests, model_outputs):
         logits = model_outputs["logits"]
         new_tokens_device = torch.argmax(logits, dim=-1)
@@ -178,7 +178,7 @@ class MTPDecoder(TorchDecoder):
     """
 
     def __init__(self, max_seq_len: int, config: MTPConfig):
-        super().__init__(max_seq_len, False)
+        super().__init__(max_seq_len, False, is_spec_decode=True)
         self.mapping = None
         self.draft_len = config.num_nextn_predict_layers
 
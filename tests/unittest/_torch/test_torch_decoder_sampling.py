@@ -0,0 +1,193 @@
+import pytest
+import torch
+
+from tensorrt_llm._torch.pyexecutor.decoder import (IS_TRITON_AVAILABLE,
+                                                    greedy_search_sampling_batch,
+                                                    top_k_sampling_batch,
+                                                    top_p_sampling_batch)
+from tensorrt_llm._torch.pyexecutor.llm_request import StopWordsAutomaton
+
+skip_no_cuda = pytest.mark.skipif(not torch.cuda.is_available(),
+                                  reason="needs a CUDA device")
+skip_no_triton = pytest.mark.skipif(not IS_TRITON_AVAILABLE,
+                                    reason="needs triton")
+
+
+def naive_stop_word_match(tokens, stop_words):
+    """Reference implementation: does any stop word end at the last token?"""
+    for word in stop_words:
+        if len(word) <= len(tokens) and tokens[-len(word):] == word:
+            return True
+    return False
+
+
+def make_automaton(stop_words, pad_to=None):
+    flat = [token for word in stop_words for token in word]
+    prefix_sum = []
+    offset = 0
+    for word in stop_words:
+        offset += len(word)
+        prefix_sum.append(offset)
+    if pad_to is not None:
+        prefix_sum += [-1] * (pad_to - len(prefix_sum))
+    return StopWordsAutomaton(flat, prefix_sum)
+
+
+def test_stop_words_automaton_matches_naive_scan():
+    stop_words = [[3, 4, 5], [7], [4, 5, 4], [5, 5]]
+    automaton = make_automaton(stop_words)
+    torch.manual_seed(0)
+    stream = torch.randint(0, 8, (512, )).tolist()
+    tokens = []
+    for token in stream:
+        tokens.append(token)
+        assert automaton.advance(token) == naive_stop_word_match(
+            tokens, stop_words)
+    assert automaton.num_consumed == len(stream)
+
+
+def test_stop_words_automaton_overlapping_matches():
+    automaton = make_automaton([[1, 1]])
+    assert not automaton.advance(1)
+    assert automaton.advance(1)
+    # the second occurrence overlaps the first and must still match
+    assert automaton.advance(1)
+    assert not automaton.advance(2)
+
+
+def test_stop_words_automaton_ignores_prefix_sum_padding():
+    # convert_wordlist() pads prefix_sum with -1 entries
+    automaton = make_automaton([[2, 3]], pad_to=4)
+    assert not automaton.advance(2)
+    assert automaton.advance(3)
+
+
+def distinct_logits(batch_size, vocab_size, seed=0):
+    """Rows of well-separated values so top-k sets survive bf16 rounding."""
+    torch.manual_seed(seed)
+    values = torch.linspace(-5.0, 5.0, vocab_size)
+    return torch.stack(
+        [values[torch.randperm(vocab_size)] for _ in range(batch_size)])
+
+
+def test_greedy_search_sampling_batch():
+    logits = distinct_logits(8, 64)
+    next_tokens, log_probs = greedy_search_sampling_batch(logits)
+    assert torch.equal(next_tokens, logits.argmax(dim=-1))
+    ref = torch.log_softmax(logits, dim=-1).gather(
+        -1, next_tokens.unsqueeze(-1)).squeeze(-1)
+    torch.testing.assert_close(log_probs, ref)
+
+
+def test_top_k_sampling_batch_stays_in_top_k():
+    logits = distinct_logits(16, 128)
+    top_k = 8
+    allowed = torch.topk(logits, top_k, dim=-1).indices
+    ref_log_probs = torch.log_softmax(logits.to(torch.bfloat16).float(),
+                                      dim=-1)
+    torch.manual_seed(0)
+    for _ in range(64):
+        next_tokens, log_probs = top_k_sampling_batch(logits, top_k=top_k)
+        assert (next_tokens.unsqueeze(-1) == allowed).any(dim=-1).all()
+        ref = ref_log_probs.gather(-1, next_tokens.unsqueeze(-1)).squeeze(-1)
+        torch.testing.assert_close(log_probs, ref, atol=5e-2, rtol=5e-2)
+
+
+def test_top_k_sampling_batch_per_row_k():
+    logits = distinct_logits(4, 64)
+    top_k = torch.tensor([1, 2, 4, 8])
+    torch.manual_seed(0)
+    for _ in range(64):
+        next_tokens, _ = top_k_sampling_batch(logits, top_k=top_k)
+        for row, k in enumerate(top_k.tolist()):
+            allowed = torch.topk(logits[row], k).indices
+            assert next_tokens[row] in allowed
+
+
+def test_top_k_sampling_batch_distribution():
+    # One row repeated many times gives many draws per call; the empirical
+    # frequencies must match the renormalized top-k probabilities
+    row = torch.tensor([2.0, 1.5, 1.0, 0.5, -1.0, -2.0, -3.0, -4.0])
+    top_k = 4
+    logits = row.repeat(20000, 1)
+    expected = torch.softmax(row, dim=-1)
+    expected = expected * (row >= row.topk(top_k).values[-1])
+    expected = expected / expected.sum()
+    torch.manual_seed(0)
+    next_tokens, _ = top_k_sampling_batch(logits, top_k=top_k)
+    freq = torch.bincount(next_tokens, minlength=row.numel()) / logits.shape[0]
+    torch.testing.assert_close(freq, expected, atol=2e-2, rtol=0.0)
+
+
+def test_top_p_sampling_batch_stays_in_nucleus():
+    probs = torch.tensor([0.5, 0.3, 0.1, 0.05, 0.03, 0.02])
+    # cumsum < 0.75 keeps token 0, plus the entry crossing the threshold;
+    # 0.75 sits safely between the 0.5 and 0.8 cumsum steps so bf16
+    # rounding cannot move the cutoff
+    logits = probs.log().repeat(4096, 1)
+    torch.manual_seed(0)
+    next_tokens, _ = top_p_sampling_batch(logits, top_p=0.75)
+    assert set(next_tokens.tolist()) <= {0, 1}
+    # both nucleus members must actually be sampled at these sizes
+    assert set(next_tokens.tolist()) == {0, 1}
+
+
+def test_top_p_sampling_batch_per_row_p():
+    probs = torch.tensor([0.5, 0.3, 0.1, 0.05, 0.03, 0.02])
+    logits = probs.log().repeat(2, 1)
+    top_p = torch.tensor([0.4, 0.75])
+    torch.manual_seed(0)
+    for _ in range(64):
+        next_tokens, _ = top_p_sampling_batch(logits, top_p=top_p)
+        assert next_tokens[0] == 0
+        assert next_tokens[1] in (0, 1)
+
+
+@skip_no_cuda
+@skip_no_triton
+def test_top_k_sample_triton_matches_eager_support():
+    from tensorrt_llm._torch.pyexecutor.decoder import top_k_sample_triton
+    logits = distinct_logits(16, 128).cuda()
+    top_k = 8
+    allowed = torch.topk(logits, top_k, dim=-1).indices
+    ref_log_probs = torch.log_softmax(logits, dim=-1)
+    torch.manual_seed(0)
+    for _ in range(64):
+        next_tokens, log_probs = top_k_sample_triton(logits, top_k=top_k)
+        assert (next_tokens.unsqueeze(-1) == allowed).any(dim=-1).all()
+        ref = ref_log_probs.gather(-1, next_tokens.unsqueeze(-1)).squeeze(-1)
+        torch.testing.assert_close(log_probs, ref, atol=1e-3, rtol=1e-3)
+
+
+@skip_no_cuda
+@skip_no_triton
+def test_top_k_sample_triton_breaks_ties_by_index():
+    from tensorrt_llm._torch.pyexecutor.decoder import top_k_sample_triton
+    # Four lanes tie at the k boundary; like torch.topk, only the two with
+    # the lowest indices may be sampled
+    row = torch.zeros(16)
+    row[:4] = 2.0
+    logits = row.repeat(64, 1).cuda()
+    seen = set()
+    torch.manual_seed(0)
+    for _ in range(32):
+        next_tokens, _ = top_k_sample_triton(logits, top_k=2)
+        seen.update(next_tokens.tolist())
+    assert seen == {0, 1}
+
+
+@skip_no_cuda
+@skip_no_triton
+def test_top_k_sample_triton_distribution_matches_eager():
+    from tensorrt_llm._torch.pyexecutor.decoder import top_k_sample_triton
+    row = torch.tensor([2.0, 1.5, 1.0, 0.5, -1.0, -2.0, -3.0, -4.0])
+    top_k = 4
+    logits = row.repeat(20000, 1).cuda()
+    expected = torch.softmax(row, dim=-1)
+    expected = expected * (row >= row.topk(top_k).values[-1])
+    expected = expected / expected.sum()
+    torch.manual_seed(0)
+    next_tokens, _ = top_k_sample_triton(logits, top_k=top_k)
+    freq = torch.bincount(next_tokens.cpu(),
+                          minlength=row.numel()) / logits.shape[0]
+    torch.testing.assert_close(freq, expected, atol=2e-2, rtol=0.0)